@@ -54,6 +54,11 @@ SV_API int __cdecl sv_startSpeakW(SV_STATE* s, const wchar_t* text);
 // - For markers: 0
 SV_API int __cdecl sv_read(SV_STATE* s, int* outType, int* outValue, uint8_t* outBuf, int outBufBytes);
 
+// Like sv_read, but copies consecutive audio items into outBuf in one call.
+// Returns the audio byte count. outType is the item that ended the batch:
+// SV_ITEM_AUDIO if outBuf filled up, else NONE, DONE or ERROR (already consumed).
+SV_API int __cdecl sv_readBatch(SV_STATE* s, int* outType, int* outValue, uint8_t* outBuf, int outBufBytes);
+
 // SoftVoice numeric settings (int ranges follow tibase32 semantics)
 SV_API void __cdecl sv_setVoice(SV_STATE* s, int voice);
 SV_API int __cdecl sv_getVoice(SV_STATE* s);
@@ -120,6 +125,10 @@ SV_API int __cdecl sv_getPauseFactor(SV_STATE* s);
 // Output audio format for the current synthesis session.
 SV_API int __cdecl sv_getFormat(SV_STATE* s, int* sampleRate, int* channels, int* bitsPerSample);
 
+// Convert count samples of 8-bit unsigned PCM to 16-bit signed PCM.
+// dst must have room for count int16 samples. Needs no SV_STATE.
+SV_API void __cdecl sv_convertU8ToS16(const uint8_t* src, int16_t* dst, int count);
+
 #ifdef __cplusplus
 } // extern "C"
 #endif
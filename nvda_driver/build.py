@@ -3,7 +3,9 @@
 
 import os
 import sys
+import time
 import zipfile
+from pathlib import Path
 
 if sys.version_info < (3, 0):
 	raise Exception("Python 3 required")
@@ -30,7 +32,10 @@ ADDON_FILES = {
 
 	# SynthDriver Python files. This set mirrors the tested working install:
 	# the driver runs through NVDA's synthDriverHost32 bridge (2026.1+); the
-	# _host/_sv_ipc pair supports the pre-bridge fallback path.
+	# _host/_sv_ipc pair supports the pre-bridge fallback path.  Their wire
+	# format is versioned (_sv_ipc.PROTOCOL_VERSION, checked at connect), so
+	# a softvoice_host32.exe built with build.cmd must come from the same
+	# sources as _sv_ipc.py.
 	"synthDrivers/sv.py": os.path.join(SYNTH_DIR, "sv.py"),
 	"synthDrivers/_softvoice.py": os.path.join(SYNTH_DIR, "_softvoice.py"),
 	"synthDrivers/_host_softvoice32.py": os.path.join(SYNTH_DIR, "_host_softvoice32.py"),
@@ -46,11 +51,34 @@ ADDON_FILES = {
 }
 
 
+# Members up to this size are read in one go and added with writestr();
+# larger ones (the engine DLLs) are streamed by ZipFile.write().
+SMALL_FILE_LIMIT = 1 << 20
+
+# Binaries gain next to nothing from DEFLATE, so they are stored as-is.
+STORED_EXTENSIONS = (".dll", ".exe")
+
+
+def _compress_type(arc_name):
+	"""Return the zip compression method for an archive member."""
+	if arc_name.lower().endswith(STORED_EXTENSIONS):
+		return zipfile.ZIP_STORED
+	return zipfile.ZIP_DEFLATED
+
+
+def _safe_stat(path):
+	"""Return os.stat(path), or None if the file does not exist."""
+	try:
+		return os.stat(path)
+	except FileNotFoundError:
+		return None
+
+
 def main():
-	missing = []
-	for arc_name, src_path in ADDON_FILES.items():
-		if not os.path.exists(src_path):
-			missing.append((arc_name, src_path))
+	# Stat every source once; existence, sizes and the zip loop reuse it.
+	stats = {arc_name: _safe_stat(src_path) for arc_name, src_path in ADDON_FILES.items()}
+	missing = [(arc_name, src_path) for arc_name, src_path in ADDON_FILES.items()
+			   if stats[arc_name] is None]
 
 	if missing:
 		print("WARNING: Missing files:")
@@ -61,22 +89,32 @@ def main():
 	# Only require the Python files and manifest to exist
 	required = ["manifest.ini", "synthDrivers/sv.py", "synthDrivers/_softvoice.py"]
 	for r in required:
-		if r in [m[0] for m in missing]:
+		if stats[r] is None:
 			print(f"ERROR: Required file missing: {r}")
 			sys.exit(1)
 
 	print(f"Creating {OUTPUT_NAME}...")
-	with zipfile.ZipFile(OUTPUT_PATH, "w", zipfile.ZIP_DEFLATED) as zf:
+	# Give the archive a 64 KB write buffer so DEFLATE's many small
+	# writes are batched before they reach the file.
+	with open(OUTPUT_PATH, "wb", buffering=1 << 16) as out, zipfile.ZipFile(out, "w") as zf:
 		for arc_name, src_path in ADDON_FILES.items():
-			if os.path.exists(src_path):
-				zf.write(src_path, arc_name)
-				size = os.path.getsize(src_path)
-				print(f"  + {arc_name} ({size:,} bytes)")
+			st = stats[arc_name]
+			if st is not None:
+				if st.st_size <= SMALL_FILE_LIMIT:
+					# Reuse the stat we already have instead of letting
+					# zf.write() open and stat the file again.
+					zinfo = zipfile.ZipInfo(arc_name, time.localtime(st.st_mtime)[:6])
+					zinfo.external_attr = (st.st_mode & 0xFFFF) << 16
+					zinfo.compress_type = _compress_type(arc_name)
+					zf.writestr(zinfo, Path(src_path).read_bytes(), compresslevel=6)
+				else:
+					zf.write(src_path, arc_name, compress_type=_compress_type(arc_name), compresslevel=6)
+				print(f"  + {arc_name} ({st.st_size:,} bytes)")
 			else:
 				print(f"  - {arc_name} (SKIPPED - not found)")
 
 	print(f"\nCreated {OUTPUT_PATH}")
-	print(f"Size: {os.path.getsize(OUTPUT_PATH):,} bytes")
+	print(f"Size: {os.stat(OUTPUT_PATH).st_size:,} bytes")
 
 
 if __name__ == "__main__":
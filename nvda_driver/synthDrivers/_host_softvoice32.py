@@ -30,6 +30,18 @@ SV_ITEM_ERROR = 3
 
 LOGGER = logging.getLogger("softvoice.host")
 
+# Audio from sv_read is coalesced before it is queued for sending: a frame
+# goes out once it reaches _AUDIO_FLUSH_BYTES, or once _AUDIO_FLUSH_INTERVAL
+# seconds have passed since the previous frame.
+_AUDIO_FLUSH_BYTES = 16384
+_AUDIO_FLUSH_INTERVAL = 0.02
+
+# While sv_read has nothing for us, the read loop sleeps for
+# _IDLE_SLEEP_MIN seconds, doubling on each consecutive empty read up to
+# _IDLE_SLEEP_MAX.
+_IDLE_SLEEP_MIN = 0.0002
+_IDLE_SLEEP_MAX = 0.002
+
 # DLL setter functions that the client is allowed to call via dllCall
 _ALLOWED_DLL_CALLS = frozenset({
 	"sv_setRate", "sv_setPitch", "sv_setF0Range", "sv_setF0Perturb",
@@ -40,10 +52,12 @@ _ALLOWED_DLL_CALLS = frozenset({
 })
 
 
-def configure_logging(log_dir: Optional[str]) -> None:
+def configure_logging(log_dir: Optional[str], level: int = logging.INFO) -> None:
+	# DEBUG is opt-in (--verbose): anything logged from the audio loop would
+	# otherwise be formatted for every sv_read.
 	logging.basicConfig(
 		filename=os.path.join(log_dir, "softvoice-host.log") if log_dir else None,
-		level=logging.DEBUG,
+		level=level,
 		format="%(asctime)s %(levelname)s %(message)s",
 	)
 
@@ -58,27 +72,42 @@ class HostConfig:
 class SoftVoiceRuntime:
 	"""Wraps access to the 32-bit softvoice_wrapper.dll."""
 
-	def __init__(self, send_func: Callable[[dict], None], config: HostConfig):
+	def __init__(self, send_func: Callable[[Any], None], config: HostConfig):
 		self._send_func = send_func
 		self._config = config
 		self._dll = None
 		self._handle = None
 		self._should_stop = False
+		# Bound DLL functions (filled by _setup_ctypes)
+		self._sv_read = None
+		self._sv_startSpeakW = None
+		self._sv_stop = None
+		self._setters: Dict[str, Callable[..., None]] = {}
 		# Audio format (filled after init)
 		self._sample_rate = 0
 		self._channels = 0
 		self._bits_per_sample = 0
-		# Read buffer
-		self._buf_size = 65536
+		# Read buffer.  sv_read copies at most one queued wrapper item per
+		# call, so size this to cover the largest item in a single read.
+		self._buf_size = 1 << 18
 		self._audio_buf = ctypes.create_string_buffer(self._buf_size)
+		self._audio_view = memoryview(self._audio_buf)
 		self._out_type = ctypes.c_int(0)
 		self._out_value = ctypes.c_int(0)
+		# Pending (not yet sent) audio
+		self._pending = bytearray()
+		self._last_flush = 0.0
+
+	def _send_audio(self, data, final: bool) -> None:
+		"""Queue audio for the client.
 
-	def _send_event(self, event: str, **payload: object) -> None:
+		It is queued as an AudioFrame, which the sender writes as a raw
+		binary frame without pickling.
+		"""
 		try:
-			self._send_func({"type": "event", "event": event, "payload": payload})
+			self._send_func(_ipc.AudioFrame(data, final))
 		except Exception:
-			LOGGER.exception("Failed to send event %s", event)
+			LOGGER.exception("Failed to send audio event")
 
 	# ------------------------------------------------------------------
 	# Initialization
@@ -94,8 +123,8 @@ class SoftVoiceRuntime:
 			raise RuntimeError("sv_initW returned NULL")
 
 		# Detect optional features
-		has_pause_factor = hasattr(self._dll, "sv_setPauseFactor")
-		has_trim_silence = hasattr(self._dll, "sv_setTrimSilence")
+		has_pause_factor = "sv_setPauseFactor" in self._setters
+		has_trim_silence = "sv_setTrimSilence" in self._setters
 
 		# Query audio format
 		sr = ctypes.c_int(0)
@@ -120,6 +149,9 @@ class SoftVoiceRuntime:
 			},
 			"hasPauseFactor": has_pause_factor,
 			"hasTrimSilence": has_trim_silence,
+			# Setters this DLL supports; the client can skip anything else
+			# without a round-trip.
+			"dllCalls": sorted(self._setters),
 		}
 
 	def _setup_ctypes(self):
@@ -148,72 +180,112 @@ class SoftVoiceRuntime:
 		)
 		dll.sv_getFormat.restype = ctypes.c_int
 		# All setter functions: (handle, int) -> void
+		setters = {}
 		for func_name in _ALLOWED_DLL_CALLS:
 			if hasattr(dll, func_name):
 				fn = getattr(dll, func_name)
 				fn.argtypes = (ctypes.c_void_p, ctypes.c_int)
 				fn.restype = None
+				setters[func_name] = fn
+		# Bind the hot functions once so calls skip the ctypes attribute lookup.
+		self._sv_read = dll.sv_read
+		self._sv_startSpeakW = dll.sv_startSpeakW
+		self._sv_stop = dll.sv_stop
+		self._setters = setters
 
 	# ------------------------------------------------------------------
 	# Speech
 	def speak(self, text: str) -> None:
 		"""Start speech and pump audio until done."""
 		self._should_stop = False
-		rc = self._dll.sv_startSpeakW(self._handle, text)
+		self._pending = bytearray()
+		rc = self._sv_startSpeakW(self._handle, text)
 		if rc != 0:
 			LOGGER.error("sv_startSpeakW returned %d", rc)
-			self._send_event("audio", data=b"", index=None, final=True)
+			self._send_audio(b"", True)
 			return
 		self._read_loop()
 
 	def _read_loop(self) -> None:
-		"""Pull items from the wrapper and queue them as events.
+		"""Pull items from the wrapper and queue their audio for sending.
 
-		Because _send_event uses a queue (never blocks), this loop
-		always checks _should_stop promptly â€” unlike a direct TCP
+		Because _send_audio only queues (never blocks), this loop
+		always checks _should_stop promptly — unlike a direct TCP
 		sendall() which could block indefinitely.
 		"""
+		# Bind everything the loop touches to locals once; byref() objects
+		# stay valid for the lifetime of the ctypes values they wrap.
+		sv_read = self._sv_read
+		handle = self._handle
+		out_type = self._out_type
+		type_ref = ctypes.byref(out_type)
+		value_ref = ctypes.byref(self._out_value)
+		buf = self._audio_buf
+		bsz = self._buf_size
+		view = self._audio_view
+		flush_audio = self._flush_audio
+		send_audio = self._send_audio
+		monotonic = time.monotonic
+		sleep = time.sleep
+		idle = 0
 		while not self._should_stop:
 			try:
-				n = self._dll.sv_read(
-					self._handle,
-					ctypes.byref(self._out_type),
-					ctypes.byref(self._out_value),
-					self._audio_buf,
-					self._buf_size,
-				)
+				n = sv_read(handle, type_ref, value_ref, buf, bsz)
 			except Exception:
 				LOGGER.exception("sv_read crashed")
-				self._send_event("audio", data=b"", index=None, final=True)
+				send_audio(b"", True)
 				return
 
-			t = self._out_type.value
+			t = out_type.value
 
 			if t == SV_ITEM_AUDIO and n > 0:
-				self._send_event("audio", data=self._audio_buf.raw[:n], index=None, final=False)
+				idle = 0
+				pending = self._pending
+				pending += view[:n]
+				if (len(pending) >= _AUDIO_FLUSH_BYTES
+						or monotonic() - self._last_flush >= _AUDIO_FLUSH_INTERVAL):
+					flush_audio()
 			elif t == SV_ITEM_DONE:
-				self._send_event("audio", data=b"", index=None, final=True)
+				flush_audio()
+				send_audio(b"", True)
 				return
 			elif t == SV_ITEM_ERROR:
 				LOGGER.error("Wrapper error %d", self._out_value.value)
-				self._send_event("audio", data=b"", index=None, final=True)
+				flush_audio()
+				send_audio(b"", True)
 				return
 			elif t == SV_ITEM_NONE:
-				time.sleep(0.001)
+				if self._pending and monotonic() - self._last_flush >= _AUDIO_FLUSH_INTERVAL:
+					flush_audio()
+				sleep(min(_IDLE_SLEEP_MAX, _IDLE_SLEEP_MIN * (1 << idle)))
+				if idle < 4:
+					idle += 1
+		self._pending = bytearray()
+
+	def _flush_audio(self) -> None:
+		"""Queue the coalesced audio as a single non-final event."""
+		if not self._pending:
+			return
+		# Hand the buffer itself to the send queue and start a new one,
+		# rather than copying it into a bytes object.
+		data = self._pending
+		self._pending = bytearray()
+		self._last_flush = time.monotonic()
+		self._send_audio(data, False)
 
 	# ------------------------------------------------------------------
 	# Control
 	def stop(self) -> None:
 		self._should_stop = True
 		if self._handle:
-			self._dll.sv_stop(self._handle)
+			self._sv_stop(self._handle)
 
 	def dll_call(self, func_name: str, value: int) -> None:
 		"""Call a whitelisted sv_set* function."""
-		if func_name not in _ALLOWED_DLL_CALLS:
-			raise ValueError(f"Disallowed DLL call: {func_name}")
-		fn = getattr(self._dll, func_name, None)
+		fn = self._setters.get(func_name)
 		if fn is None:
+			if func_name not in _ALLOWED_DLL_CALLS:
+				raise ValueError(f"Disallowed DLL call: {func_name}")
 			raise AttributeError(f"DLL has no function: {func_name}")
 		fn(self._handle, value)
 
@@ -245,8 +317,7 @@ class HostController:
 		self._conn = conn
 		self._runtime: Optional[SoftVoiceRuntime] = None
 		self._should_exit = False
-		self._speak_thread: Optional[threading.Thread] = None
-		self._speak_gen = 0  # incremented on each speak; old threads bail
+		self._speak_gen = 0  # incremented on each speak; stale work bails
 		# Send queue: all outgoing messages go through here so that
 		# neither the main recv loop nor the speak thread ever blocks
 		# on TCP sendall().
@@ -255,6 +326,12 @@ class HostController:
 		self._sender_thread = threading.Thread(
 			target=self._sender_loop, daemon=True, name="HostSender")
 		self._sender_thread.start()
+		# Speak work runs on one long-lived thread instead of a fresh
+		# thread per utterance.  Items are (msg_id, handler, payload, gen).
+		self._work_q: queue.SimpleQueue = queue.SimpleQueue()
+		self._worker = threading.Thread(
+			target=self._worker_loop, daemon=True, name="HostSpeakWorker")
+		self._worker.start()
 		self._handlers = {
 			"initialize": self._handle_initialize,
 			"speak": self._handle_speak,
@@ -277,13 +354,22 @@ class HostController:
 				break
 			if msg is None:
 				break
-			# Drop audio events when stop is active
-			if (self._drop_audio
-					and msg.get("type") == "event"
-					and msg.get("event") == "audio"):
+			is_audio = isinstance(msg, _ipc.AudioFrame)
+			# Drop audio when stop is active
+			if is_audio and self._drop_audio:
 				continue
 			try:
-				self._conn.send(msg)
+				# Where TCP_CORK exists, let the kernel coalesce bulk audio;
+				# the final audio frame and every other message must go out
+				# immediately.  Elsewhere both calls do nothing.
+				if is_audio and not msg.final:
+					self._conn.cork()
+				else:
+					self._conn.uncork()
+				if is_audio:
+					self._conn.send_audio(msg.data, msg.final)
+				else:
+					self._conn.send(msg)
 			except Exception:
 				LOGGER.exception("Sender thread: send failed")
 				break
@@ -312,18 +398,11 @@ class HostController:
 				continue
 
 			if command == "speak":
-				# Launch speak in a background thread.  A generation
-				# counter ensures superseded threads bail immediately.
+				# Hand speak to the worker thread.  A generation counter
+				# ensures superseded requests bail without speaking.
 				self._speak_gen += 1
-				gen = self._speak_gen
 				self._drop_audio = False  # allow audio for new speak
-				prev_thread = self._speak_thread
-				self._speak_thread = threading.Thread(
-					target=self._run_speak_thread,
-					args=(msg_id, handler, message.get("payload", {}), prev_thread, gen),
-					daemon=True,
-				)
-				self._speak_thread.start()
+				self._work_q.put((msg_id, handler, message.get("payload", {}), self._speak_gen))
 			else:
 				try:
 					payload = handler(**message.get("payload", {}))
@@ -333,22 +412,26 @@ class HostController:
 				except Exception as exc:
 					LOGGER.exception("Command %s failed", command)
 					self._queue_send({"type": "response", "id": msg_id, "error": str(exc)})
-		# Shut down the sender thread
+		# Shut down the worker and sender threads
+		self._stop_worker()
 		self._send_queue.put(None)
 		self._sender_thread.join(timeout=3)
 
-	def _run_speak_thread(self, msg_id: int, handler, payload: Dict[str, Any],
-						  prev_thread: Optional[threading.Thread],
-						  gen: int) -> None:
-		"""Run a speak command, waiting briefly for any previous speak."""
-		# If a newer speak already arrived, this one is stale â€” bail.
-		if gen != self._speak_gen:
-			self._queue_send({"type": "response", "id": msg_id, "payload": {"status": "cancelled"}})
-			return
-		# Wait briefly for the old thread; give up quickly.
-		if prev_thread and prev_thread.is_alive():
-			prev_thread.join(timeout=2)
-		# Check again after the wait.
+	def _stop_worker(self) -> None:
+		if self._worker.is_alive():
+			self._work_q.put(None)
+			self._worker.join(timeout=2)
+
+	def _worker_loop(self) -> None:
+		"""Run queued speak commands one at a time."""
+		while True:
+			item = self._work_q.get()
+			if item is None:
+				break
+			self._run_speak(*item)
+
+	def _run_speak(self, msg_id: int, handler, payload: Dict[str, Any], gen: int) -> None:
+		"""Run a speak command unless a newer speak has superseded it."""
 		if gen != self._speak_gen:
 			self._queue_send({"type": "response", "id": msg_id, "payload": {"status": "cancelled"}})
 			return
@@ -377,6 +460,7 @@ class HostController:
 
 	def _handle_stop(self, **_kw) -> Dict:
 		self._drop_audio = True  # tell sender to skip pending audio
+		self._speak_gen += 1  # cancel speaks still waiting on the worker
 		if self._runtime:
 			self._runtime.stop()
 		return {"status": "ok"}
@@ -390,10 +474,10 @@ class HostController:
 
 	def _handle_delete(self, **_kw) -> Dict:
 		self._drop_audio = True
+		self._speak_gen += 1
 		if self._runtime:
 			self._runtime.stop()
-		if self._speak_thread and self._speak_thread.is_alive():
-			self._speak_thread.join(timeout=2)
+		self._stop_worker()
 		if self._runtime:
 			self._runtime.delete()
 		self._should_exit = True
@@ -405,13 +489,13 @@ def main() -> None:
 	parser.add_argument("--address", required=True)
 	parser.add_argument("--authkey", required=True)
 	parser.add_argument("--log-dir", default=None)
+	parser.add_argument("--verbose", action="store_true", help="Log at DEBUG level")
 	args = parser.parse_args()
 
-	configure_logging(args.log_dir)
+	configure_logging(args.log_dir, logging.DEBUG if args.verbose else logging.INFO)
 	LOGGER.info("Connecting to controller at %s", args.address)
 
-	host, port_str = args.address.split(":")
-	address = (host, int(port_str))
+	address = _ipc.parse_address(args.address)
 	authkey = bytes.fromhex(args.authkey)
 	conn = _ipc.connect_to_listener(address, authkey)
 	controller = HostController(conn)
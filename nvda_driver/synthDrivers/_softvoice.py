@@ -6,13 +6,15 @@ the entire synth driver (including this module) runs inside NVDA's built-in
 """
 from __future__ import annotations
 
+import array
+import collections
 import ctypes
 import logging
 import os
 import queue
 import threading
 import time
-from typing import Any, Callable, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 LOGGER = logging.getLogger(__name__)
 
@@ -23,118 +25,270 @@ SV_ITEM_DONE = 2
 SV_ITEM_ERROR = 3
 
 # DLL setter functions allowed for dll_call
-_ALLOWED_DLL_CALLS = frozenset({
+_SETTER_NAMES = (
 	"sv_setRate", "sv_setPitch", "sv_setF0Range", "sv_setF0Perturb",
 	"sv_setVowelFactor", "sv_setAVBias", "sv_setAFBias", "sv_setAHBias",
 	"sv_setPersonality", "sv_setF0Style", "sv_setVoicingMode", "sv_setGender",
 	"sv_setGlottalSource", "sv_setSpeakingMode", "sv_setVoice",
 	"sv_setPauseFactor", "sv_setTrimSilence", "sv_setMaxLeadMs",
-})
-
-AudioChunk = Tuple[bytes, Optional[int], bool, int]  # (data, index, is_final, seq)
-
-
-def _convert_audio(data: bytes) -> bytes:
+)
+_ALLOWED_DLL_CALLS = frozenset(_SETTER_NAMES)
+
+# Setter name -> id for dll_call_id(), which skips the name lookup.
+SETTER_IDS: Dict[str, int] = {name: i for i, name in enumerate(_SETTER_NAMES)}
+
+# _read_loop queues the first audio of an utterance at once, then queues
+# audio once this many bytes have accumulated, or once this many seconds
+# have passed since the last batch.  Same limits as the host and src/sv.py.
+_AUDIO_FLUSH_BYTES = 16384
+_AUDIO_FLUSH_INTERVAL = 0.02
+
+# When sv_read has nothing yet, _read_loop retries immediately for the first
+# _IDLE_SPIN empty reads, then yields with sleep(0) until _IDLE_YIELD, then
+# sleeps _IDLE_SLEEP seconds between reads.
+_IDLE_SPIN = 4
+_IDLE_YIELD = 32
+_IDLE_SLEEP = 0.0005
+
+# sv_read is called in a tight loop, so it gets its own prototype instance
+# (see SoftVoiceDirectClient._setup_ctypes).  The wrapper is cdecl.
+_SV_READ_PROTO = ctypes.CFUNCTYPE(
+	ctypes.c_int,
+	ctypes.c_void_p,
+	ctypes.POINTER(ctypes.c_int),
+	ctypes.POINTER(ctypes.c_int),
+	ctypes.c_void_p,
+	ctypes.c_int,
+)
+
+AudioChunk = Tuple[Union[bytes, bytearray], Optional[int], bool, int]  # (data, index, is_final, seq)
+
+
+# (b - 128) << 8 as little-endian int16 is a zero low byte followed by
+# b ^ 0x80, so the whole conversion is one translate() and one strided copy.
+_U8_TO_S16_HIGH = bytes(b ^ 0x80 for b in range(256))
+
+
+def _convert_audio(data: Union[bytes, bytearray], scratch: bytearray,
+				   native_convert: Optional[Callable[..., None]] = None) -> bytes:
 	"""Convert 8-bit unsigned PCM to 16-bit signed PCM.
 
 	The SoftVoice engine outputs 8-bit unsigned PCM.
 	NVDA's WASAPI backend can't handle 8-bit, so we convert to 16-bit.
 	WASAPI handles the 11025 Hz resampling natively.
+
+	``scratch`` must hold at least twice ``len(data)`` bytes and have its
+	even (low) bytes zeroed; the translate() fallback only writes the odd
+	bytes, and the native converter writes zeros there.
+
+	``native_convert`` is the wrapper's sv_convertU8ToS16 (SSE2) when the
+	loaded DLL exports it; without it, translate() does the work.
 	"""
-	import array
-	return array.array('h', ((b - 128) << 8 for b in data)).tobytes()
+	n = 2 * len(data)
+	if native_convert is not None:
+		src = data if isinstance(data, bytes) else (ctypes.c_char * len(data)).from_buffer(data)
+		native_convert(src, (ctypes.c_char * n).from_buffer(scratch), len(data))
+	else:
+		scratch[1:n:2] = data.translate(_U8_TO_S16_HIGH)
+	return bytes(memoryview(scratch)[:n])
 
 
 # ---------------------------------------------------------------------------
 # Audio handling (shared by both 32-bit and 64-bit modes)
 # ---------------------------------------------------------------------------
 
+class AudioRing:
+	"""FIFO of audio chunks drained by a single AudioWorker.
+
+	deque.append() and popleft() are atomic, so producers never take a
+	lock; the Event is only touched to wake a consumer that found the
+	ring empty.
+
+	With ``max_bytes`` set, put_audio() holds the read loop back while
+	that much audio is queued, so a stalled player cannot make the ring
+	grow without bound.  Nothing is dropped: markers and done items must
+	still arrive.  The byte totals each have a single writer (producer,
+	consumer and clear() respectively), so they need no lock either.
+	"""
+
+	def __init__(self, max_bytes: int = 0) -> None:
+		self._items: "collections.deque[Optional[AudioChunk]]" = collections.deque()
+		self._ready = threading.Event()
+		self.max_bytes = max_bytes
+		self._put_bytes = 0
+		self._got_bytes = 0
+		self._cleared_bytes = 0
+		self._space = threading.Event()
+
+	def put(self, item: Optional[AudioChunk]) -> None:
+		self._items.append(item)
+		if not self._ready.is_set():
+			self._ready.set()
+
+	def put_audio(self, item: AudioChunk, abort: Callable[[], bool]) -> bool:
+		"""put() an audio chunk once the ring is below max_bytes.
+
+		Returns False without queueing if abort() becomes true first.
+		"""
+		limit = self.max_bytes
+		if limit:
+			space = self._space
+			while self._queued_bytes() >= limit:
+				space.clear()
+				# get() may have made room between the check and clear().
+				if self._queued_bytes() < limit:
+					break
+				if abort():
+					return False
+				space.wait(0.05)
+			# clear() (stop) also wakes the wait above; don't queue stale audio.
+			if abort():
+				return False
+		self._put_bytes += len(item[0])
+		self.put(item)
+		return True
+
+	def _queued_bytes(self) -> int:
+		return self._put_bytes - self._got_bytes - self._cleared_bytes
+
+	def clear(self) -> None:
+		"""Drop everything queued (stop).
+
+		Items are popped one at a time so a concurrent get() never loses
+		or double-counts one; the ring holds at most max_bytes of audio,
+		so this is a handful of batches plus markers.
+		"""
+		items = self._items
+		cleared = 0
+		while True:
+			try:
+				item = items.popleft()
+			except IndexError:
+				break
+			if item is not None:
+				cleared += len(item[0])
+			else:
+				# Keep a worker shutdown request.
+				items.append(None)
+				break
+		self._cleared_bytes += cleared
+		self._space.set()
+
+	def get(self, timeout: Optional[float] = None) -> Optional[AudioChunk]:
+		"""Pop the oldest chunk, waiting up to timeout; raises queue.Empty."""
+		items = self._items
+		ready = self._ready
+		while True:
+			try:
+				item = items.popleft()
+			except IndexError:
+				pass
+			else:
+				if item is not None and item[0]:
+					self._got_bytes += len(item[0])
+					if not self._space.is_set():
+						self._space.set()
+				return item
+			ready.clear()
+			# A put() may have landed between popleft() and clear().
+			if items:
+				continue
+			if not ready.wait(timeout):
+				raise queue.Empty
+
+
 class AudioWorker(threading.Thread):
 	"""Pulls audio events from the queue and feeds them to nvwave.WavePlayer."""
 
-	def __init__(self, player, audio_queue: "queue.Queue[Optional[AudioChunk]]",
-				 get_sequence: Callable[[], int], convert_8to16: bool = False,
+	def __init__(self, player, audio_queue: AudioRing,
+				 sequence: "array.array[int]", convert_8to16: bool = False,
 				 player_lock: Optional[threading.RLock] = None,
-				 auto_idle: bool = True):
+				 auto_idle: bool = True,
+				 native_convert: Optional[Callable[..., None]] = None):
 		super().__init__(daemon=True, name="SoftVoiceAudioWorker")
 		self._player = player
 		self._queue = audio_queue
-		self._get_sequence = get_sequence
+		self._sequence = sequence  # one-element array owned by the client
 		self._convert_8to16 = convert_8to16
-		self._running = True
+		self._native_convert = native_convert
 		self._stopping = False
 		self._player_lock = player_lock or threading.RLock()
 		self._auto_idle = auto_idle
+		# Reused 16-bit output buffer for _convert_audio; grown on demand.
+		self._scratch = bytearray(2 * 65536)
 
 	def run(self) -> None:
-		while self._running:
-			try:
-				chunk = self._queue.get(timeout=0.1)
-			except queue.Empty:
-				continue
+		# Bind loop-invariant attributes once; _stopping and _scratch
+		# change while running and are still read from self.
+		get = self._queue.get
+		sequence = self._sequence
+		player = self._player
+		player_lock = self._player_lock
+		convert = self._convert_8to16
+		native_convert = self._native_convert
+		auto_idle = self._auto_idle
+		while True:
+			# stop() queues None; nothing else ends the loop, so there
+			# is no need to wake up periodically.
+			chunk = get()
 			if chunk is None:
 				break
 
 			data, second, is_final, seq = chunk
 
-			if seq < self._get_sequence():
-				self._queue.task_done()
+			if seq < sequence[0]:
 				continue
 
 			# Marker callback: feed empty buffer with onDone to WavePlayer
 			if callable(second):
 				if not self._stopping:
 					try:
-						with self._player_lock:
-							if not self._stopping and self._player:
-								self._player.feed(b"", onDone=second)
+						with player_lock:
+							if not self._stopping and player:
+								player.feed(b"", onDone=second)
 					except Exception:
 						LOGGER.exception("Marker feed failed")
-				self._queue.task_done()
 				continue
 
 			# Idle signal
 			if second == "IDLE":
 				if not self._stopping:
 					try:
-						with self._player_lock:
-							if not self._stopping and self._player:
-								self._player.idle()
+						with player_lock:
+							if not self._stopping and player:
+								player.idle()
 					except Exception:
 						LOGGER.exception("Player idle failed")
-				self._queue.task_done()
 				continue
 
 			# Done marker (from _read_loop)
 			if not data and second is None:
-				if is_final and self._auto_idle:
-					with self._player_lock:
+				if is_final and auto_idle:
+					with player_lock:
 						if not self._stopping:
-							self._player.idle()
+							player.idle()
 					if not self._stopping:
 						self._invoke_done_callback()
-				self._queue.task_done()
 				continue
 
 			if self._stopping:
-				self._queue.task_done()
 				continue
 
 			try:
-				if self._convert_8to16 and data:
-					data = _convert_audio(data)
-				with self._player_lock:
-					if not self._stopping and self._player:
-						self._player.feed(data)
+				if convert and data:
+					if 2 * len(data) > len(self._scratch):
+						self._scratch = bytearray(2 * len(data))
+					data = _convert_audio(data, self._scratch, native_convert)
+				with player_lock:
+					if not self._stopping and player:
+						player.feed(data)
 			except FileNotFoundError:
 				LOGGER.warning("Sound device not found during feed")
 			except Exception:
 				LOGGER.exception("WavePlayer feed failed")
-			self._queue.task_done()
 
 	def stop(self) -> None:
 		self._stopping = True
-		self._running = False
 		self._queue.put(None)
 
 	def _invoke_done_callback(self) -> None:
@@ -155,12 +309,18 @@ class SoftVoiceDirectClient:
 	def __init__(self) -> None:
 		self._dll = None
 		self._handle = None
-		self._audio_queue: "queue.Queue[Optional[AudioChunk]]" = queue.Queue()
+		self._audio_queue = AudioRing()
 		self._player = None
 		self._player_lock = threading.RLock()
 		self._audio_worker: Optional[AudioWorker] = None
+		# Bound setters by SETTER_IDS; None where the DLL lacks one
+		self._setter_fns: List[Optional[Callable[..., None]]] = [None] * len(_SETTER_NAMES)
+		self._convert_8to16 = False
+		# sv_convertU8ToS16 when the loaded DLL exports it (see _setup_ctypes)
+		self._native_convert: Optional[Callable[..., None]] = None
 		self._should_stop = False
-		self._sequence = 0
+		# Bumped by stop(); a one-element array so AudioWorker can share it
+		self._sequence = array.array("q", [0])
 		self._current_seq = 0
 		# Audio format
 		self._sample_rate = 0
@@ -172,8 +332,14 @@ class SoftVoiceDirectClient:
 		# Read buffer
 		self._buf_size = 65536
 		self._audio_buf = None
+		self._audio_mv: Optional[memoryview] = None
 		self._out_type = None
 		self._out_value = None
+		# Persistent sv_read arguments (see _read_loop)
+		self._sv_read = None
+		self._p_out_type = None
+		self._p_out_value = None
+		self._audio_buf_ptr = None
 
 	def do_initialize(self, dll_path: str, tibase_path: str, initial_voice: int) -> Dict[str, Any]:
 		"""Load the wrapper DLL and initialize the engine.
@@ -200,8 +366,12 @@ class SoftVoiceDirectClient:
 			self._setup_ctypes()
 
 		self._audio_buf = ctypes.create_string_buffer(self._buf_size)
+		self._audio_mv = memoryview(self._audio_buf).cast("B")
 		self._out_type = ctypes.c_int(0)
 		self._out_value = ctypes.c_int(0)
+		self._p_out_type = ctypes.pointer(self._out_type)
+		self._p_out_value = ctypes.pointer(self._out_value)
+		self._audio_buf_ptr = ctypes.c_void_p(ctypes.addressof(self._audio_buf))
 
 		self._handle = self._dll.sv_initW(tibase_path, initial_voice)
 		if not self._handle:
@@ -251,6 +421,7 @@ class SoftVoiceDirectClient:
 			ctypes.c_int,
 		)
 		dll.sv_read.restype = ctypes.c_int
+		self._sv_read = _SV_READ_PROTO(("sv_read", dll))
 		dll.sv_getFormat.argtypes = (
 			ctypes.c_void_p,
 			ctypes.POINTER(ctypes.c_int),
@@ -258,11 +429,16 @@ class SoftVoiceDirectClient:
 			ctypes.POINTER(ctypes.c_int),
 		)
 		dll.sv_getFormat.restype = ctypes.c_int
-		for func_name in _ALLOWED_DLL_CALLS:
+		if hasattr(dll, "sv_convertU8ToS16"):
+			dll.sv_convertU8ToS16.argtypes = (ctypes.c_void_p, ctypes.c_void_p, ctypes.c_int)
+			dll.sv_convertU8ToS16.restype = None
+			self._native_convert = dll.sv_convertU8ToS16
+		for setter_id, func_name in enumerate(_SETTER_NAMES):
 			if hasattr(dll, func_name):
 				fn = getattr(dll, func_name)
 				fn.argtypes = (ctypes.c_void_p, ctypes.c_int)
 				fn.restype = None
+				self._setter_fns[setter_id] = fn
 
 	# ------------------------------------------------------------------
 	# Audio
@@ -281,6 +457,7 @@ class SoftVoiceDirectClient:
 		# Let WASAPI handle the 11025 Hz resampling natively.
 		convert_8to16 = (bits_per_sample == 8)
 		player_bps = 16 if convert_8to16 else bits_per_sample
+		self._convert_8to16 = convert_8to16
 
 		if version_year >= 2025:
 			device = config.conf["audio"]["outputDevice"]
@@ -291,11 +468,14 @@ class SoftVoiceDirectClient:
 			player = nvwave.WavePlayer(channels, sample_rate, player_bps,
 									   outputDevice=device, buffered=True)
 		self._player = player
+		# Let the read loop run at most about two seconds ahead of playback.
+		self._audio_queue.max_bytes = 2 * sample_rate * channels * max(1, bits_per_sample // 8)
 		self._audio_worker = AudioWorker(player, self._audio_queue,
-										 lambda: self._sequence,
+										 self._sequence,
 										 convert_8to16=convert_8to16,
 										 player_lock=self._player_lock,
-										 auto_idle=False)
+										 auto_idle=False,
+										 native_convert=self._native_convert)
 		self._audio_worker.start()
 
 	# ------------------------------------------------------------------
@@ -303,7 +483,7 @@ class SoftVoiceDirectClient:
 	def do_speak(self, text: str) -> bool:
 		"""Start speech and pump read loop. Returns True on success."""
 		self._should_stop = False
-		self._current_seq = self._sequence
+		self._current_seq = self._sequence[0]
 		rc = self._dll.sv_startSpeakW(self._handle, text)
 		if rc != 0:
 			LOGGER.error("sv_startSpeakW returned %d", rc)
@@ -312,48 +492,101 @@ class SoftVoiceDirectClient:
 		return self._read_loop()
 
 	def _read_loop(self) -> bool:
-		"""Poll sv_read() and push audio to queue. Returns True if completed normally."""
+		"""Poll sv_read() and push audio to queue. Returns True if completed normally.
+
+		The first audio is queued at once so batching never delays the
+		start of speech.  After that, audio is coalesced and queued once
+		_AUDIO_FLUSH_BYTES have built up or _AUDIO_FLUSH_INTERVAL has
+		passed, so the worker wakes once per batch rather than once per
+		wrapper item.
+		"""
+		put = self._audio_queue.put
+		put_audio = self._audio_queue.put_audio
+		stop_requested = self._stop_requested
+		seq = self._current_seq
+		# When the worker converts to 16-bit it only reads each batch, so
+		# the bytearray itself can be queued and a new one started; a
+		# batch fed to the player as-is must be bytes.
+		hand_off = self._convert_8to16
+		# Everything sv_read takes is already a ctypes object of the
+		# declared type, so no argument conversion happens per call.
+		sv_read = self._sv_read
+		handle = ctypes.c_void_p(self._handle)
+		p_out_type = self._p_out_type
+		p_out_value = self._p_out_value
+		buf_ptr = self._audio_buf_ptr
+		buf_size = self._buf_size
+		pending = bytearray()
+		# Zero makes the interval check pass for the first audio item.
+		last_flush = 0.0
+		idle = 0
 		while not self._should_stop:
 			try:
-				n = self._dll.sv_read(
-					self._handle,
-					ctypes.byref(self._out_type),
-					ctypes.byref(self._out_value),
-					self._audio_buf,
-					self._buf_size,
-				)
+				n = sv_read(handle, p_out_type, p_out_value, buf_ptr, buf_size)
 			except Exception:
 				LOGGER.exception("sv_read crashed")
-				self._audio_queue.put((b"", None, True, self._current_seq))
+				if pending:
+					put_audio((pending if hand_off else bytes(pending), None, False, seq), stop_requested)
+				put((b"", None, True, seq))
 				return False
 
 			t = self._out_type.value
 
 			if t == SV_ITEM_AUDIO and n > 0:
-				self._audio_queue.put((bytes(self._audio_buf.raw[:n]), None, False, self._current_seq))
+				idle = 0
+				pending += self._audio_mv[:n]
+				if (len(pending) >= _AUDIO_FLUSH_BYTES
+						or time.monotonic() - last_flush >= _AUDIO_FLUSH_INTERVAL):
+					put_audio((pending if hand_off else bytes(pending), None, False, seq), stop_requested)
+					pending = bytearray()
+					last_flush = time.monotonic()
 			elif t == SV_ITEM_DONE:
-				self._audio_queue.put((b"", None, True, self._current_seq))
+				if pending:
+					put_audio((pending if hand_off else bytes(pending), None, False, seq), stop_requested)
+				put((b"", None, True, seq))
 				return True
 			elif t == SV_ITEM_ERROR:
 				LOGGER.error("Wrapper error %d", self._out_value.value)
-				self._audio_queue.put((b"", None, True, self._current_seq))
+				if pending:
+					put_audio((pending if hand_off else bytes(pending), None, False, seq), stop_requested)
+				put((b"", None, True, seq))
 				return False
 			elif t == SV_ITEM_NONE:
-				time.sleep(0.001)
+				if pending and time.monotonic() - last_flush >= _AUDIO_FLUSH_INTERVAL:
+					put_audio((pending if hand_off else bytes(pending), None, False, seq), stop_requested)
+					pending = bytearray()
+					last_flush = time.monotonic()
+				# Back off gradually: retry at once, then just yield the
+				# CPU, and only then sleep.  A fixed 1 ms sleep can round
+				# up to a full timer tick on Windows.
+				if idle >= _IDLE_SPIN:
+					time.sleep(0 if idle < _IDLE_YIELD else _IDLE_SLEEP)
+				idle += 1
 		return False
 
+	def _stop_requested(self) -> bool:
+		return self._should_stop
+
 	# ------------------------------------------------------------------
 	# Control
 	def dll_call(self, func_name: str, value: int) -> None:
-		if func_name not in _ALLOWED_DLL_CALLS:
+		setter_id = SETTER_IDS.get(func_name)
+		if setter_id is None:
 			raise ValueError(f"Disallowed: {func_name}")
-		fn = getattr(self._dll, func_name, None)
+		self.dll_call_id(setter_id, value)
+
+	def dll_call_id(self, setter_id: int, value: int) -> None:
+		fn = self._setter_fns[setter_id]
 		if fn:
 			fn(self._handle, value)
 
 	def stop(self) -> None:
-		self._sequence += 1
+		self._sequence[0] += 1
 		self._should_stop = True
+		# Everything queued is stale now; drop it instead of letting the
+		# worker skip it chunk by chunk.  This also wakes the read loop
+		# if it is waiting for room.
+		self._audio_queue.clear()
 		if self._audio_worker:
 			self._audio_worker._stopping = True
 		if self._handle:
@@ -400,8 +633,8 @@ class SoftVoiceDirectClient:
 		# Do NOT call sv_free — the SoftVoice engine cannot be
 		# re-initialized after teardown.  Keep the DLL and handle
 		# alive; the OS reclaims everything when NVDA exits.
-		self._audio_queue = queue.Queue()
-		self._sequence = 0
+		self._audio_queue = AudioRing()
+		self._sequence[0] = 0
 		self._current_seq = 0
 
 
@@ -466,6 +699,11 @@ def dll_call(func_name: str, value: int) -> None:
 	_client.dll_call(func_name, value)
 
 
+def dll_call_id(setter_id: int, value: int) -> None:
+	"""Call a sv_set* function by its SETTER_IDS id."""
+	_client.dll_call_id(setter_id, value)
+
+
 def stop() -> None:
 	_client.stop()
 
@@ -5,13 +5,62 @@ Original: https://github.com/Fastfinge/eloquence_64
 """
 from __future__ import annotations
 
+import hmac
+import io
+import os
 import pickle
+import secrets
 import socket
-import struct
+import tempfile
 import threading
-from typing import Any, Tuple
-
-_HEADER_STRUCT = struct.Struct("!I")
+from typing import Any, NamedTuple, Tuple, Union
+
+# Either a Unix domain socket path or a TCP (host, port) pair.
+Address = Union[str, Tuple[str, int]]
+
+# Frame layout (all lengths are 4-byte big-endian unsigned ints):
+#   length   (of the pickle that follows)
+#   pickle   (protocol 5)
+#
+# Audio frames skip pickle entirely: the length slot holds _AUDIO_FRAME,
+# and a second length slot holds the data length, with _AUDIO_FINAL set
+# on the last frame of an utterance.  The raw data follows directly.
+#
+# On connecting, the connecting side sends the raw authkey followed by
+# PROTOCOL_VERSION, without waiting for a reply, so the handshake adds no
+# round-trip.  accept_authenticated() checks both before returning the
+# connection, so nothing is sent to or unpickled from an unauthenticated
+# peer.
+#
+# Bump PROTOCOL_VERSION on any change to the framing above; both ends
+# must run the same version.  Version 1 sent the bare authkey and nothing
+# after it, so a key with no version behind it is reported as version 1.
+PROTOCOL_VERSION = 2
+_LENGTH_SIZE = 4
+_LENGTH_PLACEHOLDER = bytes(_LENGTH_SIZE)
+_PICKLE_PROTOCOL = 5
+_AUDIO_FRAME = 0xFFFFFFFF
+_AUDIO_TAG = _AUDIO_FRAME.to_bytes(_LENGTH_SIZE, "big")
+_AUDIO_FINAL = 0x80000000
+
+# recv() reads up to this much per syscall and parses frames out of what
+# has been buffered; payloads larger than this are received in place.
+_RECV_CHUNK = 65536
+
+# Linux only; elsewhere cork() and uncork() do nothing and TCP_NODELAY
+# stays on, since the host already coalesces audio into large frames.
+_TCP_CORK = getattr(socket, "TCP_CORK", None)
+
+# Both processes always run on the same machine, so prefer a Unix domain
+# socket (a much shorter kernel path than loopback TCP) where Python
+# provides one.  Windows builds of Python do not, and use loopback TCP.
+_HAS_AF_UNIX = hasattr(socket, "AF_UNIX")
+
+
+class AudioFrame(NamedTuple):
+	"""Audio sent with send_audio(); recv() returns one per audio frame."""
+	data: Any  # bytes-like
+	final: bool
 
 
 class IpcConnection:
@@ -20,21 +69,82 @@ class IpcConnection:
 	def __init__(self, sock: socket.socket):
 		self._sock = sock
 		self._send_lock = threading.Lock()
+		self._corked = False
+		self._is_tcp = sock.family in (socket.AF_INET, socket.AF_INET6)
+		self._rbuf = bytearray()
+		self._scratch = memoryview(bytearray(_RECV_CHUNK))
 
 	def send(self, payload: Any) -> None:
-		data = pickle.dumps(payload, protocol=4)
-		header = _HEADER_STRUCT.pack(len(data))
+		# Pickle straight after a reserved length slot so the frame goes
+		# out in a single sendall() without concatenating copies.
+		stream = io.BytesIO()
+		stream.write(_LENGTH_PLACEHOLDER)
+		pickle.dump(payload, stream, protocol=_PICKLE_PROTOCOL)
+		with stream.getbuffer() as frame:
+			frame[:_LENGTH_SIZE] = (len(frame) - _LENGTH_SIZE).to_bytes(_LENGTH_SIZE, "big")
+			with self._send_lock:
+				self._sock.sendall(frame)
+
+	def send_audio(self, data: Any, final: bool) -> None:
+		"""Send raw audio without pickling it."""
+		view = memoryview(data)
+		length = view.nbytes
+		header = _AUDIO_TAG + (length | (_AUDIO_FINAL if final else 0)).to_bytes(_LENGTH_SIZE, "big")
 		with self._send_lock:
 			self._sock.sendall(header)
-			self._sock.sendall(data)
+			if length:
+				self._sock.sendall(view)
 
 	def recv(self) -> Any:
-		header = _recv_exact(self._sock, _HEADER_STRUCT.size)
-		if not header:
-			raise EOFError
-		(length,) = _HEADER_STRUCT.unpack(header)
-		data = _recv_exact(self._sock, length)
-		return pickle.loads(data)
+		pickle_len = int.from_bytes(self._read(_LENGTH_SIZE), "big")
+		if pickle_len == _AUDIO_FRAME:
+			field = int.from_bytes(self._read(_LENGTH_SIZE), "big")
+			return AudioFrame(self._read(field & ~_AUDIO_FINAL), bool(field & _AUDIO_FINAL))
+		return pickle.loads(self._read(pickle_len))
+
+	def _read(self, length: int) -> bytearray:
+		"""Take exactly ``length`` bytes from the receive buffer.
+
+		Each recv_into() pulls in as much as the socket has ready, so a
+		burst of small frames is usually parsed out of a single syscall.
+		"""
+		rbuf = self._rbuf
+		have = len(rbuf)
+		if length - have > _RECV_CHUNK:
+			# Bulk payload: skip the staging buffer for the remainder.
+			out = bytearray(length)
+			out[:have] = rbuf
+			rbuf.clear()
+			_recv_into(self._sock, memoryview(out)[have:])
+			return out
+		scratch = self._scratch
+		while have < length:
+			n = self._sock.recv_into(scratch)
+			if not n:
+				raise EOFError
+			rbuf += scratch[:n]
+			have += n
+		out = rbuf[:length]
+		del rbuf[:length]
+		return out
+
+	def cork(self) -> None:
+		"""Let the kernel coalesce subsequent sends (bulk audio)."""
+		if _TCP_CORK is not None and self._is_tcp and not self._corked:
+			self._corked = True
+			self._set_cork(True)
+
+	def uncork(self) -> None:
+		"""Flush anything held back by cork() and send immediately again."""
+		if self._corked:
+			self._corked = False
+			self._set_cork(False)
+
+	def _set_cork(self, enabled: bool) -> None:
+		try:
+			self._sock.setsockopt(socket.IPPROTO_TCP, _TCP_CORK, int(enabled))
+		except OSError:
+			pass
 
 	def close(self) -> None:
 		try:
@@ -45,52 +155,101 @@ class IpcConnection:
 
 
 def create_listener() -> socket.socket:
-	sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-	sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-	sock.bind(("127.0.0.1", 0))
+	if _HAS_AF_UNIX:
+		path = os.path.join(
+			tempfile.gettempdir(), f"softvoice-{os.getpid()}-{secrets.token_hex(8)}.sock")
+		sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+		sock.bind(path)
+		os.chmod(path, 0o600)
+	else:
+		sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+		sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+		sock.bind(("127.0.0.1", 0))
 	sock.listen(1)
 	return sock
 
 
+def format_address(address: Address) -> str:
+	"""Render a listener address for the host's --address argument."""
+	if isinstance(address, str):
+		return address
+	return f"{address[0]}:{address[1]}"
+
+
+def parse_address(text: str) -> Address:
+	"""Inverse of format_address."""
+	host, sep, port = text.rpartition(":")
+	if sep and port.isdigit():
+		return (host, int(port))
+	return text
+
+
 _SOCK_BUF_SIZE = 2 * 1024 * 1024  # 2 MB — enough for ~30 audio chunks
+_AUTH_TIMEOUT = 5.0  # seconds the accepting side waits for the authkey and version
 
 
 def accept_authenticated(listener: socket.socket, authkey: bytes) -> IpcConnection:
 	conn, _ = listener.accept()
+	if listener.family == getattr(socket, "AF_UNIX", None):
+		# Only one host ever connects; the path is no longer needed.
+		try:
+			os.unlink(listener.getsockname())
+		except OSError:
+			pass
 	conn.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, _SOCK_BUF_SIZE)
 	conn.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, _SOCK_BUF_SIZE)
-	_authenticate_server(conn, authkey)
+	_set_nodelay(conn)
+	# The key and version were sent right after connecting, so these reads
+	# do not wait on a round-trip; the timeout only bounds a silent peer.
+	conn.settimeout(_AUTH_TIMEOUT)
+	key = bytearray(len(authkey))
+	try:
+		_recv_into(conn, memoryview(key))
+		ok = hmac.compare_digest(bytes(key), authkey)
+	except (OSError, EOFError):
+		ok = False
+	if not ok:
+		conn.close()
+		raise ConnectionError("authentication failed")
+	field = bytearray(_LENGTH_SIZE)
+	try:
+		_recv_into(conn, memoryview(field))
+		version = int.from_bytes(field, "big")
+	except (OSError, EOFError):
+		# A version 1 peer stops after the key.
+		version = 1
+	conn.settimeout(None)
+	if version != PROTOCOL_VERSION:
+		conn.close()
+		raise ConnectionError(
+			f"host speaks IPC protocol {version}, expected {PROTOCOL_VERSION}; "
+			"rebuild softvoice_host32.exe from this add-on's sources")
 	return IpcConnection(conn)
 
 
-def connect_to_listener(address: Tuple[str, int], authkey: bytes) -> IpcConnection:
-	sock = socket.create_connection(address)
+def connect_to_listener(address: Address, authkey: bytes) -> IpcConnection:
+	if isinstance(address, str):
+		sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+		sock.connect(address)
+	else:
+		sock = socket.create_connection(address)
 	sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, _SOCK_BUF_SIZE)
 	sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, _SOCK_BUF_SIZE)
-	_send_all(sock, authkey)
-	sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+	_set_nodelay(sock)
+	sock.sendall(authkey + PROTOCOL_VERSION.to_bytes(_LENGTH_SIZE, "big"))
 	return IpcConnection(sock)
 
 
-def _authenticate_server(sock: socket.socket, authkey: bytes) -> None:
-	data = _recv_exact(sock, len(authkey))
-	if data != authkey:
-		sock.close()
-		raise ConnectionError("authentication failed")
-	sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+def _set_nodelay(sock: socket.socket) -> None:
+	if sock.family in (socket.AF_INET, socket.AF_INET6):
+		sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
 
 
-def _recv_exact(sock: socket.socket, length: int) -> bytes:
-	remaining = length
-	chunks = []
-	while remaining:
-		chunk = sock.recv(remaining)
-		if not chunk:
+def _recv_into(sock: socket.socket, view: memoryview) -> None:
+	offset = 0
+	length = len(view)
+	while offset < length:
+		n = sock.recv_into(view[offset:], length - offset)
+		if not n:
 			raise EOFError
-		chunks.append(chunk)
-		remaining -= len(chunk)
-	return b"".join(chunks)
-
-
-def _send_all(sock: socket.socket, data: bytes) -> None:
-	sock.sendall(data)
+		offset += n
@@ -40,6 +40,7 @@
 #include <windows.h>
 #include <mmsystem.h>
 #include <intrin.h>
+#include <emmintrin.h>
 
 #include <atomic>
 #include <cstddef>
@@ -1892,6 +1893,27 @@ extern "C" SV_API void __cdecl sv_setPauseFactor(SV_STATE* s, int factor) {
     s->pauseFactor.store(factor, std::memory_order_relaxed);
 }
 
+extern "C" SV_API int __cdecl sv_readBatch(SV_STATE* s, int* outType, int* outValue, uint8_t* outAudio, int outCap) {
+    // Drain back-to-back audio items in one call. *outType is the item that ended the batch:
+    // SV_ITEM_AUDIO when outAudio filled up, otherwise NONE/DONE/ERROR (already consumed).
+    int type = SV_ITEM_NONE;
+    int value = 0;
+    int total = 0;
+    if (!s || !outAudio || outCap < 0) {
+        if (outType) *outType = SV_ITEM_NONE;
+        if (outValue) *outValue = 0;
+        return 0;
+    }
+    while (total < outCap) {
+        const int n = sv_read(s, &type, &value, outAudio + total, outCap - total);
+        if (type != SV_ITEM_AUDIO) break;
+        total += n;
+    }
+    if (outType) *outType = type;
+    if (outValue) *outValue = value;
+    return total;
+}
+
 extern "C" SV_API int __cdecl sv_getFormat(SV_STATE* s, int* sampleRate, int* channels, int* bitsPerSample) {
     if (!s || !s->formatValid) return 0;
     if (sampleRate) *sampleRate = (int)s->lastFormat.nSamplesPerSec;
@@ -1900,6 +1922,24 @@ extern "C" SV_API int __cdecl sv_getFormat(SV_STATE* s, int* sampleRate, int* ch
     return 1;
 }
 
+// 8-bit unsigned PCM -> 16-bit signed PCM, (b - 128) << 8 per sample.
+// In little-endian int16 that is a zero low byte followed by b ^ 0x80, so
+// SSE2 can do 16 samples per step with one xor and two byte interleaves.
+extern "C" SV_API void __cdecl sv_convertU8ToS16(const uint8_t* src, int16_t* dst, int count) {
+    if (!src || !dst || count <= 0) return;
+    int i = 0;
+    const __m128i bias = _mm_set1_epi8((char)0x80);
+    const __m128i zero = _mm_setzero_si128();
+    for (; i + 16 <= count; i += 16) {
+        __m128i v = _mm_xor_si128(_mm_loadu_si128((const __m128i*)(src + i)), bias);
+        _mm_storeu_si128((__m128i*)(dst + i), _mm_unpacklo_epi8(zero, v));
+        _mm_storeu_si128((__m128i*)(dst + i + 8), _mm_unpackhi_epi8(zero, v));
+    }
+    for (; i < count; ++i) {
+        dst[i] = (int16_t)((src[i] ^ 0x80) << 8);
+    }
+}
+
 BOOL APIENTRY DllMain(HMODULE, DWORD, LPVOID) {
     return TRUE;
 }
@@ -13,12 +13,14 @@
 #    - This forces the engine to cut startup latency for fast response.
 
 import os
+import io
 import ctypes
 import threading
 import queue
 import time
 import re
-from collections import OrderedDict
+from collections import OrderedDict, deque
+from functools import lru_cache
 
 import nvwave
 import config
@@ -41,6 +43,16 @@ _wrapperRefCount = 0
 _wrapperDll = None
 
 MAX_STRING_LENGTH = 1200
+# Wrapper setters taking (handle, int).
+_INT_SETTERS = (
+    "sv_setRate", "sv_setPitch", "sv_setF0Range", "sv_setF0Perturb", "sv_setVowelFactor",
+    "sv_setAVBias", "sv_setAFBias", "sv_setAHBias", "sv_setPersonality", "sv_setF0Style",
+    "sv_setVoicingMode", "sv_setGender", "sv_setGlottalSource", "sv_setSpeakingMode", "sv_setVoice",
+)
+# After the first audio of an utterance (fed at once), back-to-back audio is fed to the
+# player once it reaches _PUMP_BATCH_BYTES or _PUMP_BATCH_INTERVAL seconds after the last feed.
+_PUMP_BATCH_BYTES = 16384
+_PUMP_BATCH_INTERVAL = 0.02
 
 # --- Background Thread ---
 class _BgThread(threading.Thread):
@@ -49,42 +61,65 @@ class _BgThread(threading.Thread):
         self.daemon = True
         self._q = q
         self._stop = stopEvent
+        # Items taken off the queue in one wake-up; discardPending() empties it.
+        self._batch = deque()
+
+    def discardPending(self):
+        self._batch.clear()
 
     def run(self):
+        batch = self._batch
         while not self._stop.is_set():
             try:
-                item = self._q.get(timeout=0.2)
+                batch.append(self._q.get(timeout=0.2))
             except queue.Empty:
                 continue
-            try:
-                if item is None: return
-                func, args, kwargs = item
-                func(*args, **kwargs)
-            except Exception:
-                log.error("SoftVoice: error running background synth function", exc_info=True)
-            finally:
+            taken = 1
+            while True:
+                try: batch.append(self._q.get_nowait())
+                except queue.Empty: break
+                taken += 1
+            done = False
+            while batch:
+                try: item = batch.popleft()
+                except IndexError: break
+                if item is None:
+                    done = True
+                    break
+                try:
+                    func, args, kwargs = item
+                    func(*args, **kwargs)
+                except Exception:
+                    log.error("SoftVoice: error running background synth function", exc_info=True)
+            for _ in range(taken):
                 try: self._q.task_done()
                 except Exception: pass
+            if done: return
 
 # --- Text Cleaning ---
-_PUNCT_TRANSLATE = str.maketrans({
+_STRIP_CHARS = {"\ufeff", "\u00ad", "\u200b", "\u200c", "\u200d", "\u200e", "\u200f"}
+_CONTROL_CHARS = [*range(0x00, 0x09), 0x0b, 0x0c, *range(0x0e, 0x20), *range(0x7f, 0xa0)]
+# One translate pass folds punctuation, deletes invisible chars and blanks controls.
+_SANITIZE_TRANSLATE = str.maketrans({
     "’": "'", "‘": "'", "“": '"', "”": '"', "–": "-", "—": "-", "…": "...", "\u00a0": " ",
+    **{ch: None for ch in _STRIP_CHARS},
+    **{chr(c): " " for c in _CONTROL_CHARS},
 })
-_control_re = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]+")
-_STRIP_CHARS = {"\ufeff", "\u00ad", "\u200b", "\u200c", "\u200d", "\u200e", "\u200f"}
+# Astral (non-BMP) codepoints are out of the table's reach; they become a space.
+_astral_re = re.compile("[\U00010000-\U0010FFFF]+")
 _labelColonRe = re.compile(r"([A-Za-z]{2,})\s*:\s*([A-Za-z])")
 _labelSemiRe = re.compile(r"([A-Za-z]{2,})\s*;\s*([A-Za-z])")
 _spellWordRe = re.compile(r"[A-Za-z0-9]+")
 _acronymWordRe = re.compile(r"\b[A-Z]{2,5}\b")
 
+def _spacedMatch(m: re.Match) -> str:
+    return " ".join(m.group(0))
+
 def _applyAcronymSpacing(s: str) -> str:
     """Insert spaces into short ALL-CAPS words: NVDA -> N V D A.
     This helps avoid SoftVoice expanding acronyms into unintended words.
     """
-    def _repl(m: re.Match) -> str:
-        w = m.group(0)
-        return " ".join(list(w))
-    return _acronymWordRe.sub(_repl, s)
+    return _acronymWordRe.sub(_spacedMatch, s)
 
 # --- Number processing (optional) ---
 # SoftVoice sometimes spells long digit runs. We can pre-expand numbers into words before handing text to the engine.
@@ -167,14 +202,55 @@ def _applyNumberProcessingEnglish(text: str, mode: int) -> str:
 
     return _numberTokenRe.sub(repl, text)
 
+def _collapseSpaces(s: str) -> str:
+    # isprintable() rules out every whitespace char but " ", so the usual
+    # already-collapsed text skips the split/join.
+    if s.isprintable() and "  " not in s and s[:1] != " " and s[-1:] != " ": return s
+    return " ".join(s.split())
+
 def _sanitizeText(s: str) -> str:
     if not s: return ""
-    s = s.translate(_PUNCT_TRANSLATE)
-    for ch in _STRIP_CHARS: s = s.replace(ch, "")
-    s = _control_re.sub(" ", s)
-    s = "".join((c if ord(c) <= 0xFFFF else " ") for c in s)
-    s = " ".join(s.split())
-    return s.strip()
+    if s.isascii():
+        # Only controls can need translating, and only if something is unprintable.
+        if not s.isprintable(): s = s.translate(_SANITIZE_TRANSLATE)
+        return _collapseSpaces(s)
+    s = _astral_re.sub(" ", s.translate(_SANITIZE_TRANSLATE))
+    return _collapseSpaces(s)
+
+@lru_cache(maxsize=512)
+def _safeTextCached(s: str, splitLabels: bool, acronyms: bool, numMode: int, spell: bool) -> str:
+    """Driver-side text pipeline; the key carries every setting it depends on."""
+    s = _sanitizeText(s)
+    if not s: return ""
+    if splitLabels:
+        if ":" in s: s = _labelColonRe.sub(r"\1 \2", s)
+        if ";" in s: s = _labelSemiRe.sub(r"\1 \2", s)
+    if acronyms:
+        s = _applyAcronymSpacing(s)
+    if numMode:
+        s = _applyNumberProcessingEnglish(s, numMode)
+    if spell:
+        s = _spellWordRe.sub(_spacedMatch, s)
+    return _collapseSpaces(s)
+
+def _segment(text: str, n: int) -> list:
+    """Split text into pieces of at most n chars, cutting at a space where possible.
+    The space at a cut is dropped, so collapsed text yields pieces with no edge spaces.
+    """
+    if len(text) <= n: return [text]
+    out = []
+    i = 0; L = len(text)
+    while i < L:
+        j = min(i + n, L)
+        if j < L:
+            k = text.rfind(" ", i, j + 1)
+            if k > i:
+                out.append(text[i:k])
+                i = k + 1
+                continue
+        out.append(text[i:j])
+        i = j
+    return out
 
 def _find_tibase32(base_path: str) -> str:
     for p in (os.path.join(base_path, "tibase32.dll"), os.path.join(base_path, "TIBASE32.DLL")):
@@ -189,41 +265,40 @@ def _canonicalizeWindowsPath(p: str) -> str:
     except Exception: pass
     return p.replace("/", "\\")
 
+# --- Slider scaling ---
+# Engine values for every whole percent of each fixed slider range, so setters index instead of doing float math.
+def _paramTable(minVal: int, maxVal: int) -> tuple:
+    return tuple(int(round(minVal + (maxVal - minVal) * (float(i) / 100.0))) for i in range(101))
+
+_PARAM_TABLES = {r: _paramTable(*r) for r in ((20, 500), (10, 2000), (0, 500), (-50, 50))}
+_RATE_PARAMS = _PARAM_TABLES[(20, 500)]
+_PITCH_PARAMS = _PARAM_TABLES[(10, 2000)]
+
+# Attribute names the generic setters touch, built once instead of per call.
+_PERCENT_ATTRS = {n: f"_{n}Percent" for n in ("inflection", "perturb", "vfactor", "avbias", "afbias", "ahbias")}
+_ENUM_KEYS = {f"_{n}": n for n in ("intstyle", "vmode", "gender", "glot", "smode")}
+
 # --- Enum Definitions ---
-variants = OrderedDict()
-def _v(_id, label): variants[str(_id)] = VoiceInfo(str(_id), label)
-_v(0, "Male"); _v(1, "Female"); _v(2, "Large Male"); _v(3, "Child"); _v(4, "Giant Male")
-_v(5, "Mellow Female"); _v(6, "Mellow Male"); _v(7, "Crisp Male"); _v(8, "The Fly")
-_v(9, "Robotoid"); _v(10, "Martian"); _v(11, "Colossus"); _v(12, "Fast Fred")
-_v(13, "Old Woman"); _v(14, "Munchkin"); _v(15, "Troll"); _v(16, "Nerd")
-_v(17, "Milktoast"); _v(18, "Tipsy"); _v(19, "Choirboy")
-
-intstyles = OrderedDict()
-def _i(_id, label): intstyles[str(_id)] = VoiceInfo(str(_id), label)
-_i(0, "normal1"); _i(1, "normal2"); _i(2, "monotone"); _i(3, "sung"); _i(4, "random")
-
-vmodes = OrderedDict()
-def _m(_id, label): vmodes[str(_id)] = VoiceInfo(str(_id), label)
-_m(0, "normal"); _m(1, "breathy"); _m(2, "whispered")
-
-genders = OrderedDict()
-def _g(_id, label): genders[str(_id)] = VoiceInfo(str(_id), label)
-_g(0, "male"); _g(1, "female"); _g(2, "child"); _g(3, "giant")
-
-glots = OrderedDict()
-def _t(_id, label): glots[str(_id)] = VoiceInfo(str(_id), label)
-_t(0, "default"); _t(1, "male"); _t(2, "female"); _t(3, "child")
-_t(4, "high"); _t(5, "mellow"); _t(6, "impulse"); _t(7, "odd"); _t(8, "colossus")
-
-smodes = OrderedDict()
-def _k(_id, label): smodes[str(_id)] = VoiceInfo(str(_id), label)
-_k(0, "Natural"); _k(1, "Word-at-a-time"); _k(2, "Spelled")
-
-numprocs = OrderedDict()
-def _np(_id, label): numprocs[str(_id)] = VoiceInfo(str(_id), label)
-_np(0, "Off")
-_np(1, "Large numbers (>= 10000)")
-_np(2, "All numbers")
+# Each enum's ids are its labels' positions, starting at 0.
+def _enumInfo(labels) -> OrderedDict:
+    return OrderedDict((str(i), VoiceInfo(str(i), label)) for i, label in enumerate(labels))
+
+variants = _enumInfo((
+    "Male", "Female", "Large Male", "Child", "Giant Male",
+    "Mellow Female", "Mellow Male", "Crisp Male", "The Fly",
+    "Robotoid", "Martian", "Colossus", "Fast Fred",
+    "Old Woman", "Munchkin", "Troll", "Nerd",
+    "Milktoast", "Tipsy", "Choirboy",
+))
+intstyles = _enumInfo(("normal1", "normal2", "monotone", "sung", "random"))
+vmodes = _enumInfo(("normal", "breathy", "whispered"))
+genders = _enumInfo(("male", "female", "child", "giant"))
+glots = _enumInfo((
+    "default", "male", "female", "child",
+    "high", "mellow", "impulse", "odd", "colossus",
+))
+smodes = _enumInfo(("Natural", "Word-at-a-time", "Spelled"))
+numprocs = _enumInfo(("Off", "Large numbers (>= 10000)", "All numbers"))
 
 
 class SynthDriver(SynthDriver):
@@ -274,8 +349,18 @@ class SynthDriver(SynthDriver):
         self._playerFormat = None
         self._bufSize = 65536
         self._audioBuf = ctypes.create_string_buffer(self._bufSize)
+        # .raw copies the whole buffer on every access; slice this instead.
+        self._audioView = memoryview(self._audioBuf).cast("B")
+        # sv_read out-parameters; only the background thread pumps, so one pair is enough.
+        self._outType = ctypes.c_int(0)
+        self._outValue = ctypes.c_int(0)
+        self._pType = ctypes.byref(self._outType)
+        self._pVal = ctypes.byref(self._outValue)
         self._tailHoldBytes = 0
-        self._tailBuf = bytearray()
+        # Tail-hold ring: head/fill indices, so feeding out never shifts bytes.
+        self._ring = bytearray(self._bufSize)
+        self._ringHead = 0
+        self._ringFill = 0
         
         self.speaking = False
         self._terminating = False
@@ -358,6 +443,9 @@ class SynthDriver(SynthDriver):
             self._dll = _wrapperDll
             self._hasPauseFactor = hasattr(self._dll, "sv_setPauseFactor")
             self._hasTrimSilence = hasattr(self._dll, "sv_setTrimSilence")
+            self._hasReadBatch = hasattr(self._dll, "sv_readBatch")
+            # Setter functions resolved once; the generic setters index this by name.
+            self._setterFns = {func: getattr(self._dll, func) for func in _INT_SETTERS}
 
     def _setupPrototypes(self, dll):
         dll.sv_initW.argtypes = (ctypes.c_wchar_p, ctypes.c_int); dll.sv_initW.restype = ctypes.c_void_p
@@ -365,9 +453,9 @@ class SynthDriver(SynthDriver):
         dll.sv_startSpeakW.argtypes = (ctypes.c_void_p, ctypes.c_wchar_p); dll.sv_startSpeakW.restype = ctypes.c_int
         dll.sv_read.argtypes = (ctypes.c_void_p, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int), ctypes.c_void_p, ctypes.c_int)
         dll.sv_read.restype = ctypes.c_int
-        for func in ["sv_setRate", "sv_setPitch", "sv_setF0Range", "sv_setF0Perturb", "sv_setVowelFactor", 
-                     "sv_setAVBias", "sv_setAFBias", "sv_setAHBias", "sv_setPersonality", "sv_setF0Style", 
-                     "sv_setVoicingMode", "sv_setGender", "sv_setGlottalSource", "sv_setSpeakingMode", "sv_setVoice"]:
+        if hasattr(dll, "sv_readBatch"):
+            dll.sv_readBatch.argtypes = dll.sv_read.argtypes; dll.sv_readBatch.restype = ctypes.c_int
+        for func in _INT_SETTERS:
             getattr(dll, func).argtypes = (ctypes.c_void_p, ctypes.c_int)
         dll.sv_getFormat.argtypes = (ctypes.c_void_p, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int))
         dll.sv_getFormat.restype = ctypes.c_int
@@ -398,16 +486,19 @@ class SynthDriver(SynthDriver):
 
     def cancel(self):
         self.speaking = False
-        self._tailBuf = bytearray()
+        self._ringHead = 0; self._ringFill = 0
         if self._handle:
             try: self._dll.sv_stop(self._handle)
             except: pass
         if self._player: self._player.stop()
-        try:
-            while True:
-                self._bgQueue.get_nowait()
-                self._bgQueue.task_done()
-        except queue.Empty: pass
+        # Drop pending work in one lock hold rather than a get/task_done pair per item.
+        q = self._bgQueue
+        with q.mutex:
+            dropped = len(q.queue)
+            q.queue.clear()
+            q.unfinished_tasks = max(0, q.unfinished_tasks - dropped)
+            if not q.unfinished_tasks: q.all_tasks_done.notify_all()
+        self._bgThread.discardPending()
 
     def pause(self, switch):
         if self._player: self._player.pause(switch)
@@ -415,18 +506,23 @@ class SynthDriver(SynthDriver):
     # --- Speaking ---
     def _buildBlocks(self, speechSequence):
         blocks = []
-        textBuf = []
+        textBuf = io.StringIO()
+        hasText = False
         pendingIndexes = []
         def flush():
-            raw = " ".join(textBuf)
-            textBuf.clear()
-            safe = self._softVoiceSafeText(raw)
+            nonlocal hasText
+            safe = self._softVoiceSafeText(textBuf.getvalue())
+            textBuf.seek(0); textBuf.truncate(0); hasText = False
             blocks.append((safe, pendingIndexes.copy()))
             pendingIndexes.clear()
         for item in speechSequence:
-            if isinstance(item, str): textBuf.append(item)
+            if isinstance(item, str):
+                # Separator goes between fragments only, so already-collapsed text
+                # reaches _collapseSpaces without a trailing space.
+                if hasText: textBuf.write(" ")
+                textBuf.write(item); hasText = True
             elif isinstance(item, IndexCommand): pendingIndexes.append(item.index)
-        if textBuf or pendingIndexes: flush()
+        if hasText or pendingIndexes: flush()
         while blocks and (not blocks[-1][0]) and (not blocks[-1][1]): blocks.pop()
         anyText = any(bool(t) for (t, _) in blocks)
         allIndexes = []
@@ -442,6 +538,10 @@ class SynthDriver(SynthDriver):
         if len(speechSequence) == 1 and isinstance(speechSequence[0], IndexCommand):
             self._enqueue(self._notifyIndexesAndDone, [speechSequence[0].index])
             return
+        if all(isinstance(item, IndexCommand) for item in speechSequence):
+            # Nothing to say; skip block building entirely.
+            self._enqueue(self._notifyIndexesAndDone, [item.index for item in speechSequence])
+            return
         blocks, anyText, allIndexes = self._buildBlocks(speechSequence)
         if not anyText:
             self._enqueue(self._notifyIndexesAndDone, allIndexes)
@@ -475,21 +575,48 @@ class SynthDriver(SynthDriver):
         frameBytes = max(1, ch * (bits // 8))
         self._tailHoldBytes = (holdBytes // frameBytes) * frameBytes
 
-    def _feedAudioWithTailHold(self, data: bytes):
+    def _feedAudioWithTailHold(self, data):
+        # data may be a view or a reused buffer; it is copied, never kept.
         if not data or not self._player: return
         if self._tailHoldBytes <= 0:
-            self._player.feed(data, len(data))
+            self._flushTail()
+            self._player.feed(bytes(data), len(data))
             return
-        self._tailBuf.extend(data)
-        if len(self._tailBuf) > self._tailHoldBytes:
-            cut = len(self._tailBuf) - self._tailHoldBytes
-            chunk = bytes(self._tailBuf[:cut])
-            del self._tailBuf[:cut]
+        n = len(data)
+        ring = self._ring; cap = len(ring)
+        head = self._ringHead; fill = self._ringFill
+        if fill + n > cap:
+            # Grow (rare: the hold changed, or a bigger batch arrived) and linearize.
+            grown = bytearray(max(cap * 2, fill + n, self._tailHoldBytes + self._bufSize))
+            first = min(fill, cap - head)
+            grown[:first] = ring[head:head + first]
+            grown[first:fill] = ring[:fill - first]
+            self._ring = ring = grown; cap = len(ring)
+            self._ringHead = head = 0
+        tail = (head + fill) % cap
+        first = min(n, cap - tail)
+        ring[tail:tail + first] = data[:first]
+        if first < n: ring[:n - first] = data[first:]
+        self._ringFill = fill = fill + n
+        if fill > self._tailHoldBytes:
+            chunk = self._ringTake(fill - self._tailHoldBytes)
             if chunk: self._player.feed(chunk, len(chunk))
 
+    def _ringTake(self, count: int) -> bytes:
+        ring = self._ring; cap = len(ring); head = self._ringHead
+        first = min(count, cap - head)
+        if first < count:
+            view = memoryview(ring)
+            chunk = b"".join((view[head:cap], view[:count - first]))
+        else:
+            chunk = bytes(ring[head:head + count])
+        self._ringHead = (head + count) % cap
+        self._ringFill -= count
+        return chunk
+
     def _flushTail(self):
-        if self._player and self._tailBuf:
-            chunk = bytes(self._tailBuf); self._tailBuf = bytearray()
+        if self._player and self._ringFill:
+            chunk = self._ringTake(self._ringFill); self._ringHead = 0
             self._player.feed(chunk, len(chunk))
 
     def _waitForPlaybackDrain(self):
@@ -504,28 +631,58 @@ class SynthDriver(SynthDriver):
             continue
 
     def _pumpUntilDone(self):
-        outType = ctypes.c_int(0); outValue = ctypes.c_int(0)
+        outType = self._outType
         playerReady = bool(self._player)
+        # Loop invariants, bound once rather than per sv_read.  sv_readBatch,
+        # when the wrapper has it, drains a whole run of audio per ctypes call.
+        sv_read = self._dll.sv_readBatch if self._hasReadBatch else self._dll.sv_read
+        handle = self._handle
+        buf = self._audioBuf; bufSize = self._bufSize; view = self._audioView
+        pType = self._pType; pVal = self._pVal
+        feed = self._feedAudioWithTailHold
+        AUDIO = SV_ITEM_AUDIO; DONE = SV_ITEM_DONE; ERR = SV_ITEM_ERROR
+        noProgress = 0
+        # Back-to-back audio items are coalesced; the first goes out immediately
+        # so batching never delays the start of speech.
+        pending = bytearray()
+        started = False
+        lastFeed = 0.0
+        monotonic = time.monotonic
         
         while self.speaking:
             madeProgress = False
             while True:
-                try: n = self._dll.sv_read(self._handle, ctypes.byref(outType), ctypes.byref(outValue), self._audioBuf, self._bufSize)
-                except: return False
+                try: n = sv_read(handle, pType, pVal, buf, bufSize)
+                except:
+                    if pending: feed(pending)
+                    return False
                 t = outType.value
-                if t == SV_ITEM_AUDIO:
-                    if n > 0:
-                        madeProgress = True
-                        if not playerReady:
-                            for _ in range(50):
-                                if self._tryCreatePlayerFromWrapper(): playerReady = True; break
-                                time.sleep(0.005)
-                        if playerReady: self._feedAudioWithTailHold(self._audioBuf.raw[:n])
-                    continue
-                if t == SV_ITEM_DONE: return True
-                if t == SV_ITEM_ERROR: return False
+                # Audio bytes can come with any item type from sv_readBatch.
+                if n > 0:
+                    madeProgress = True
+                    if not playerReady:
+                        for _ in range(50):
+                            if self._tryCreatePlayerFromWrapper(): playerReady = True; break
+                            time.sleep(0.005)
+                    if playerReady:
+                        if not started:
+                            started = True
+                            feed(view[:n]); lastFeed = monotonic()
+                        else:
+                            pending += view[:n]
+                            if len(pending) >= _PUMP_BATCH_BYTES or monotonic() - lastFeed >= _PUMP_BATCH_INTERVAL:
+                                feed(pending); pending.clear(); lastFeed = monotonic()
+                if t == AUDIO: continue
+                if pending: feed(pending); pending.clear(); lastFeed = monotonic()
+                if t == DONE: return True
+                if t == ERR: return False
                 break
-            if not madeProgress: time.sleep(0.001)
+            if madeProgress:
+                noProgress = 0
+            else:
+                # Back off 1 ms -> 2 ms -> ... capped at 5 ms while the engine is idle.
+                noProgress += 1
+                time.sleep(min(0.005, 0.001 * noProgress))
         return False
 
     def _speakBg(self, blocks):
@@ -541,7 +698,7 @@ class SynthDriver(SynthDriver):
             if appliedPitch == pct or not getattr(self, "_handle", None):
                 return
             try:
-                self._dll.sv_setPitch(self._handle, self._percentToParam(pct, 10, 2000))
+                self._dll.sv_setPitch(self._handle, _PITCH_PARAMS[pct])
                 appliedPitch = pct
             except Exception:
                 # Don't let pitch failures break speech.
@@ -552,11 +709,10 @@ class SynthDriver(SynthDriver):
         for (text, indexesAfter) in blocks:
             if not self.speaking: break
             if text:
-                text_segments = text.split(" ") if is_word_mode else [text[i : i + MAX_STRING_LENGTH] for i in range(0, len(text), MAX_STRING_LENGTH)]
+                # Block text is already whitespace-collapsed, so neither split yields empty or padded pieces.
+                text_segments = text.split() if is_word_mode else _segment(text, MAX_STRING_LENGTH)
                 for seg in text_segments:
                     if not self.speaking: break
-                    seg = seg.strip()
-                    if not seg: continue
                     if applyUserPitch:
                         desiredPitch = basePitch
                         if capDelta and len(seg) == 1 and ('A' <= seg <= 'Z'):
@@ -581,27 +737,19 @@ class SynthDriver(SynthDriver):
         if self._player: self._player.feed(b"", 0, onDone=doneCb); self._player.idle()
 
     def _softVoiceSafeText(self, s: str) -> str:
-        s = _sanitizeText(s)
-        if not s: return ""
-        if self._pauseFactorPercent < 50:
-            s = _labelColonRe.sub(r"\1 \2", s); s = _labelSemiRe.sub(r"\1 \2", s)
+        spell = str(getattr(self, "_smode", "0")) == "2"
         # Optional acronym handling: if disabled, spell short ALL-CAPS words (2-5 letters).
-        if (not bool(getattr(self, "_useAbbreviations", True))) and str(getattr(self, "_smode", "0")) != "2":
-            s = _applyAcronymSpacing(s)
-
+        acronyms = (not bool(getattr(self, "_useAbbreviations", True))) and not spell
         # Optional number expansion (helps when SoftVoice spells long digit runs).
         try: numMode = int(getattr(self, "_numproc", "0") or 0)
         except Exception: numMode = 0
-        if numMode and str(getattr(self, "curvoice", "1")) == "1" and str(getattr(self, "_smode", "0")) != "2":
-            s = _applyNumberProcessingEnglish(s, numMode)
-
-        if str(getattr(self, "_smode", "0")) == "2":
-            def _spellMatch(m): return " ".join(list(m.group(0)))
-            s = _spellWordRe.sub(_spellMatch, s)
-        return " ".join(s.split()).strip()
+        if spell or str(getattr(self, "curvoice", "1")) != "1": numMode = 0
+        return _safeTextCached(s, self._pauseFactorPercent < 50, acronyms, numMode, spell)
 
     # --- Settings ---
     def _percentToParam(self, val, minVal, maxVal):
+        table = _PARAM_TABLES.get((minVal, maxVal))
+        if table is not None and type(val) is int and 0 <= val <= 100: return table[val]
         ratio = float(val) / 100.0
         return int(round(minVal + (maxVal - minVal) * ratio))
     def _clampPercent(self, v): return max(0, min(100, int(v)))
@@ -609,31 +757,32 @@ class SynthDriver(SynthDriver):
     # Timbre Settings (protected)
     def _timbre_setter(self, name, func, minV, maxV, val):
         self._clampPercent(val)
-        current = getattr(self, f"_{name}Percent")
+        attr = _PERCENT_ATTRS[name]
+        current = getattr(self, attr)
         new_val = int(val)
         if getattr(self, "_initializing", False):
-            setattr(self, f"_{name}Percent", new_val)
+            setattr(self, attr, new_val)
             return
         if self._variant != "0" and not self._paramExplicit[name]:
-             setattr(self, f"_{name}Percent", new_val)
+             setattr(self, attr, new_val)
              if new_val != current:
                  self._paramExplicit[name] = True
-                 if self._handle: getattr(self._dll, func)(self._handle, self._percentToParam(new_val, minV, maxV))
+                 if self._handle: self._setterFns[func](self._handle, self._percentToParam(new_val, minV, maxV))
              return
-        setattr(self, f"_{name}Percent", new_val)
+        setattr(self, attr, new_val)
         self._paramExplicit[name] = True
-        if self._handle: getattr(self._dll, func)(self._handle, self._percentToParam(new_val, minV, maxV))
+        if self._handle: self._setterFns[func](self._handle, self._percentToParam(new_val, minV, maxV))
 
     def _get_rate(self): return int(self._ratePercent)
     def _set_rate(self, v):
         self._ratePercent = self._clampPercent(v)
-        if self._handle: self._dll.sv_setRate(self._handle, self._percentToParam(self._ratePercent, 20, 500))
+        if self._handle: self._dll.sv_setRate(self._handle, _RATE_PARAMS[self._ratePercent])
 
     def _get_pitch(self): return int(self._pitchPercent)
     def _set_pitch(self, v):
         self._pitchPercent = self._clampPercent(v)
         self._paramExplicit["pitch"] = True
-        if self._handle: self._dll.sv_setPitch(self._handle, self._percentToParam(self._pitchPercent, 10, 2000))
+        if self._handle: self._dll.sv_setPitch(self._handle, _PITCH_PARAMS[self._pitchPercent])
 
     def _get_inflection(self): return int(self._inflectionPercent)
     def _set_inflection(self, v): self._timbre_setter("inflection", "sv_setF0Range", 0, 500, v)
@@ -679,7 +828,7 @@ class SynthDriver(SynthDriver):
         if self._handle: self._dll.sv_setVoice(self._handle, int(v))
 
     def _set_enum_generic(self, attr_name, func_name, val_id):
-        key = attr_name.strip("_")
+        key = _ENUM_KEYS[attr_name]
         val = int(val_id)
         current = int(getattr(self, attr_name, 0))
         setattr(self, attr_name, str(val_id))
@@ -688,10 +837,10 @@ class SynthDriver(SynthDriver):
                 return
             if self._variant != "0":
                 self._paramExplicit[key] = True
-                if self._handle: getattr(self._dll, func_name)(self._handle, val)
+                if self._handle: self._setterFns[func_name](self._handle, val)
                 return
         self._paramExplicit[key] = True
-        if self._handle: getattr(self._dll, func_name)(self._handle, val)
+        if self._handle: self._setterFns[func_name](self._handle, val)
 
     def _get_availableNumprocs(self): return numprocs
     def _get_useAbbreviations(self):